@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+
+"""
+===========================================================================
+# GLEFrameStore.py
+# Single-file container for the frames of a GLEGraphVid.py run
+#
+# Frames are stored uncompressed in a zip file together with an
+# index.json member giving, for every frame, its number, timestamp and
+# the offset and size of its PNG data. A frame is read with one seek and
+# the whole run can be streamed in frame order, for instance to ffmpeg:
+#   GLEFrameStore.py -c GLE_20240511_0940.zip | ffmpeg -f image2pipe -framerate 10 -i - GLE.mp4
+#
+# Versions:
+# 1.0.0 Initial version
+# 1.1.0 Append to an existing container
+# 1.1.1 Frames written again on append replace the old copy
+"""
+import os.path
+import sys
+import json
+import warnings
+import struct
+import getopt
+import zipfile
+from datetime import datetime
+
+
+__author__      = 'Brian Lucas'
+__credits__ = ['Brian Lucas','Pierre-Simon Mangeard']
+__email__ = 'lucasb@udel.edu'
+
+indexName = 'index.json'
+localHeader = struct.Struct('<IHHHHHIIIHH')   #zip local file header
+localHeaderSignature = 0x04034b50
+
+
+def openStore(fileName, append=False):
+   """Open a frame container for writing, keeping its frames if append is set."""
+   if append and os.path.isfile(fileName):
+      return {'zip': zipfile.ZipFile(fileName, 'a', compression=zipfile.ZIP_STORED, allowZip64=True),
+              'index': readIndex(fileName)}
+   return {'zip': zipfile.ZipFile(fileName, 'w', compression=zipfile.ZIP_STORED, allowZip64=True),
+           'index': []}
+
+
+def writeFrame(store, frameNum, timestamp, data):
+   """Add the PNG bytes of a frame to an open container.
+
+   A frame already in the container is replaced in the index, so the
+   newest copy is the one read back.
+   """
+   name = '{0:06d}.png'.format(frameNum)
+   with warnings.catch_warnings():
+      warnings.filterwarnings('ignore', 'Duplicate name', UserWarning)
+      store['zip'].writestr(name, data)
+   store['index'] = [entry for entry in store['index'] if entry['frame'] != frameNum]
+   store['index'].append({'frame': frameNum, 'time': timestamp.isoformat(), 'name': name,
+                          'offset': store['zip'].getinfo(name).header_offset, 'size': len(data)})
+
+
+def closeStore(store):
+   """Write the frame index and close the container."""
+   #an appended container gets a new index after the old one, which is the one read back
+   with warnings.catch_warnings():
+      warnings.filterwarnings('ignore', 'Duplicate name', UserWarning)
+      store['zip'].writestr(indexName, json.dumps(store['index']))
+   store['zip'].close()
+
+
+def readIndex(fileName):
+   """Return the frame index of a container, in frame order."""
+   with zipfile.ZipFile(fileName, 'r') as zf:
+      return sorted(json.loads(zf.read(indexName)), key=lambda entry: entry['frame'])
+
+
+def readData(fileObj, entry):
+   """Read the PNG bytes of an index entry from an open container file."""
+   fileObj.seek(entry['offset'])
+   header = localHeader.unpack(fileObj.read(localHeader.size))
+   if localHeaderSignature != header[0]:
+      raise ValueError('No frame at offset {0:d}'.format(entry['offset']))
+   fileObj.seek(header[9]+header[10], 1)   #file name and extra field
+   return fileObj.read(entry['size'])
+
+
+def readFrame(fileName, frame=None, timestamp=None, index=None):
+   """Return the PNG bytes of a frame given by number or by timestamp.
+
+   Pass the result of readIndex() as index to avoid reading it again
+   for every frame.
+   """
+   if index is None: index = readIndex(fileName)
+   if frame is not None:
+      entries = [entry for entry in index if entry['frame'] == frame]
+   else:
+      when = datetime.fromisoformat(str(timestamp))
+      entries = [entry for entry in index if datetime.fromisoformat(entry['time']) == when]
+   if not entries:
+      raise KeyError('No frame {0} in {1:s}'.format(frame if frame is not None else timestamp, fileName))
+   with open(fileName, 'rb') as fileObj:
+      return readData(fileObj, entries[0])
+
+
+def streamFrames(fileName, index=None):
+   """Yield (index entry, PNG bytes) for every frame of a container in frame order."""
+   if index is None: index = readIndex(fileName)
+   with open(fileName, 'rb') as fileObj:
+      for entry in index:
+         yield entry, readData(fileObj, entry)
+
+
+def main(argv):
+   ########################
+   ### ARGUMENTS
+   ########################
+   fileName = ''
+   frame = None
+   timestamp = None
+   listIndex = False
+
+   strinfo='GLEFrameStore.py: options:\n'
+   strinfo=strinfo+'-c <container file>\n'
+   strinfo=strinfo+'-f <frame number> (write only this frame to stdout)\n'
+   strinfo=strinfo+'-t <timestamp> (write only the frame at this ISO 8601 time to stdout)\n'
+   strinfo=strinfo+'-l (list the frame index)\n'
+   strinfo=strinfo+'Without -f, -t or -l all frames are streamed to stdout in frame order\n'
+
+   try:
+      opts, args = getopt.getopt(argv,"hc:f:t:l")
+   except getopt.GetoptError:
+      print(strinfo)
+      sys.exit(2)
+
+   for opt, arg in opts:
+      if opt == '-h':
+         print(strinfo)
+         sys.exit()
+      elif opt in ("-c"):
+         fileName = arg
+      elif opt in ("-f"):
+         frame = int(arg)
+      elif opt in ("-t"):
+         timestamp = arg
+      elif opt in ("-l"):
+         listIndex = True
+
+   if '' == fileName:
+      print('For information: GLEFrameStore.py -h')
+      sys.exit(2)
+
+   index = readIndex(fileName)
+   if listIndex:
+      for entry in index:
+         print('{0:6d} {1:s} {2:d} {3:d}'.format(entry['frame'], entry['time'], entry['offset'], entry['size']))
+   elif frame is not None or timestamp is not None:
+      sys.stdout.buffer.write(readFrame(fileName, frame, timestamp, index))
+   else:
+      for entry, data in streamFrames(fileName, index):
+         sys.stdout.buffer.write(data)
+   sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+   main(sys.argv[1:])
+
+
+
+#END
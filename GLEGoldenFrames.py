@@ -0,0 +1,313 @@
+#!/usr/bin/python3
+
+"""
+===========================================================================
+# GLEGoldenFrames.py
+# Golden-frame equivalence and throughput check for GLEGraphVid.py
+#
+# Renders a fixed synthetic GLE day with the reference renderer and with
+# every optimized mode, compares the reference frames (first, alarm
+# transitions, baselines, last) pixel-wise with a tolerance and records
+# frames/sec. Fails when output drifts or throughput drops below the
+# stored baseline.
+#
+# Usage:
+#   GLEGoldenFrames.py -w        (store golden frames and fps baseline)
+#   GLEGoldenFrames.py           (check against the stored goldens, fails without them)
+#   GLEGoldenFrames.py -N        (compare the modes to the reference only)
+#
+# Versions:
+# 1.0.0 Initial version
+# 1.1.0 Network scenario mode
+# 1.2.0 Frame container mode
+# 1.3.0 Long-run mode
+"""
+import io
+import os
+import os.path
+import sys
+import json
+import math
+import shutil
+import getopt
+import tempfile
+import time
+from datetime import datetime, timedelta, date
+
+import numpy as np
+import pandas as pd
+
+import matplotlib as mpl
+mpl.use('Agg')
+import matplotlib.image as mpimg
+
+import GLEGraphVid
+import GLEFrameStore
+
+
+__author__      = 'Brian Lucas'
+__credits__ = ['Brian Lucas','Pierre-Simon Mangeard']
+__email__ = 'lucasb@udel.edu'
+
+
+########################
+### Synthetic event
+########################
+synthDay = date(2024, 5, 11)
+synthStart = 580     #window start [min in day], baselines need > 85 minutes
+synthEnd = 700       #window end [min in day]
+synthOnset = 645     #first minute of the increase
+synthAlarms = [650, 653, 657] #first minute of Watch, Warning, Alert
+initMinutes = 1      #as in GLEGraphVid.main
+
+########################
+### Render modes
+########################
+#name: extra GLEGraphVid.py arguments ({outdir} is replaced by the mode
+#directory) and how to read the frames back
+renderModes = {
+   'reference': {'args': [], 'frames': 'dir', 'subdir': ''},
+   #second scenario repeats the default grouping after an alternate one
+   'scenarios': {'args': ['-n', '{outdir}/scenarios.json'], 'frames': 'dir', 'subdir': 'GLE77'},
+   'container': {'args': ['-k'], 'frames': 'zip', 'subdir': ''},
+   'longrun': {'args': ['-l', '10'], 'frames': 'dir', 'subdir': ''},
+}
+
+
+def makeSyntheticDay(dirpath):
+   """Write a deterministic GLE day and GOES proton/X-ray files to dirpath."""
+   rng = np.random.default_rng(20240511)
+   tags = ['INVK','FSMT','PWNK','NAIN','NEWK','THUL','SOPO','SOPB','MCMU','JBGO','MWSN','CVAN','DRHM','HLE1','LDVL','MTWS']
+   times = pd.date_range(datetime.combine(synthDay, datetime.min.time()), periods=1440, freq='min')
+   minute = np.arange(1440)
+   rise = np.clip((minute-synthOnset)/30., 0., None)
+   decay = np.exp(-np.clip(minute-synthOnset-40, 0., None)/120.)
+
+   df = pd.DataFrame(index=pd.Index(times.strftime('%y/%m/%d %H:%M:%S'), name='Time'))
+   df['Time.1'] = df.index
+   for i, tag in enumerate(tags):
+      level = 2000.+150.*i
+      gain = 0.02*(len(tags)-i)*rise*decay
+      noise = rng.normal(0., 0.002, len(minute))
+      ith = 1.+gain+noise
+      if tag in ['CVAN','MTWS']:
+         ith[:] = np.nan   #stations without data are skipped by the display
+      df[tag] = np.round(level*ith)
+      df[tag+'T'] = level*ith
+      df[tag+'Ith'] = ith
+      df[tag+'F'] = (ith > 1.04).astype(int)
+   status = np.zeros(len(minute), dtype=int)
+   for level, start in enumerate(synthAlarms):
+      status[minute >= start] = level+1
+   df['Status'] = status
+   df.to_csv(os.path.join(dirpath, 'GLE_Day_{0:s}.csv'.format(synthDay.strftime('%Y%m%d'))))
+
+   gtimes = times.strftime('%Y-%m-%dT%H:%M:%SZ')
+   proton = []
+   xray = []
+   for j, t in enumerate(gtimes):
+      p = 0.3+50.*rise[j]*decay[j]
+      proton.append([t, 16, p, '>=10 MeV'])
+      proton.append([t, 16, 0.1*p, '>=100 MeV'])
+      x = 1e-6*(1.+30.*rise[j]*decay[j])
+      xray.append([t, 16, x, x, 0., 0, '0.1-0.8nm'])
+      xray.append([t, 16, 0.1*x, 0.1*x, 0., 0, '0.05-0.4nm'])
+   pd.DataFrame(proton, columns=['time_tag','satellite','flux','energy']).to_csv(
+         os.path.join(dirpath, 'GOES_proton.csv'), index=False)
+   pd.DataFrame(xray, columns=['time_tag','satellite','flux','observed_flux','electron_correction','electron_contaminaton','energy']).to_csv(
+         os.path.join(dirpath, 'GOES_xray.csv'), index=False)
+
+   scenarios = {'scenarios': [
+      {'name': 'Alternate', 'groups': [
+         {'label': 'North', 'stations': ['INVK','FSMT','PWNK','NAIN','NEWK','THUL']},
+         {'label': 'South', 'stations': 'others'}]},
+      {'name': 'GLE77', 'groups': [
+         {'label': 'Prototype', 'stations': ['INVK','FSMT','PWNK','NAIN','NEWK','THUL','SOPO']},
+         {'label': '+ Simpson Network', 'stations': ['SOPB','DRHM','HLE1','LDVL','MTWS']},
+         {'label': '+ Mawson', 'stations': 'others'}]}]}
+   with open(os.path.join(dirpath, 'scenarios.json'), 'w') as jsonFile:
+      json.dump(scenarios, jsonFile, indent=1)
+
+
+def referenceFrames():
+   """Frame numbers to compare: first, around each alarm transition, baseline freeze and last."""
+   #frame k shows rows 0..k+initMinutes of the window
+   lastFrame = (synthEnd-synthStart)-initMinutes
+   frames = {0, lastFrame}
+   for a in synthAlarms:
+      frames.add(a-synthStart-initMinutes-1)
+      frames.add(a-synthStart-initMinutes)
+   #baselines stop following the frame once the Alert level is reached
+   frames.add(synthAlarms[2]-synthStart-initMinutes+1)
+   return sorted(f for f in frames if 0 <= f <= lastFrame)
+
+
+def renderMode(mode, workdir):
+   """Run GLEGraphVid.main for mode in a fresh copy of the synthetic day. Return (outdir, frames/sec)."""
+   outdir = os.path.join(workdir, mode)
+   if os.path.isdir(outdir): shutil.rmtree(outdir)
+   os.makedirs(os.path.join(outdir, synthDay.strftime('%Y%m%d')))
+   makeSyntheticDay(outdir)
+   argv = ['-o', outdir, '-r', synthDay.isoformat(), '-s', str(synthStart), '-e', str(synthEnd),
+           '-p', os.path.join(outdir, 'GOES_proton.csv'), '-x', os.path.join(outdir, 'GOES_xray.csv'), '-b']
+   argv += [a.format(outdir=outdir) for a in renderModes[mode]['args']]
+
+   cwd = os.getcwd()
+   os.chdir(outdir)
+   try:
+      start = time.perf_counter()
+      GLEGraphVid.main(argv)
+      elapsed = time.perf_counter()-start
+   finally:
+      os.chdir(cwd)
+   nFrames = (synthEnd-synthStart)-initMinutes+1
+   return outdir, nFrames/elapsed
+
+
+def readFrame(mode, outdir, frameNum):
+   """Return the RGBA array of a rendered frame."""
+   if 'dir' == renderModes[mode]['frames']:
+      return mpimg.imread(os.path.join(outdir, synthDay.strftime('%Y%m%d'), renderModes[mode]['subdir'], '{0:04d}.png'.format(frameNum)))
+   if 'zip' == renderModes[mode]['frames']:
+      startTime = datetime.combine(synthDay, datetime.min.time())+timedelta(minutes=synthStart)
+      container = os.path.join(outdir, synthDay.strftime('%Y%m%d'), renderModes[mode]['subdir'],
+                               'GLE_{0:s}.zip'.format(startTime.strftime('%Y%m%d_%H%M')))
+      return mpimg.imread(io.BytesIO(GLEFrameStore.readFrame(container, frameNum)))
+   raise ValueError('Unknown frame source {0:s}'.format(renderModes[mode]['frames']))
+
+
+def frameDiff(a, b):
+   """RMS difference of two RGBA frames in [0,1], inf if the shapes differ."""
+   if a.shape != b.shape: return math.inf
+   return float(np.sqrt(np.mean((a.astype(np.float64)-b.astype(np.float64))**2)))
+
+
+def main(argv):
+   ########################
+   ### DEFINE VARIABLES
+   ########################
+   goldenPath = './golden'   #stored golden frames and fps baseline
+   workPath = ''             #render directory, temporary if not given
+   writeGolden = False
+   allowMissing = False      #run without a stored baseline
+   pixelTol = 1e-3           #max RMS difference per frame
+   fpsTol = 0.2              #allowed fractional fps drop
+   modes = list(renderModes)
+
+   ########################
+   ### ARGUMENTS
+   ########################
+
+   strinfo='GLEGoldenFrames.py: options:\n'
+   strinfo=strinfo+'-g <golden path> (default ./golden)\n'
+   strinfo=strinfo+'-d <work path> (default temporary directory)\n'
+   strinfo=strinfo+'-m <mode,mode,...> (default all: {0:s})\n'.format(','.join(renderModes))
+   strinfo=strinfo+'-t <pixel RMS tolerance> (default {0:g})\n'.format(pixelTol)
+   strinfo=strinfo+'-f <fractional frames/sec drop tolerance> (default {0:g})\n'.format(fpsTol)
+   strinfo=strinfo+'-w (write golden frames and fps baseline from this run)\n'
+   strinfo=strinfo+'-N (only compare the modes to the reference when there is no stored baseline)\n'
+
+   try:
+      opts, args = getopt.getopt(argv,"hg:d:m:t:f:wN")
+   except getopt.GetoptError:
+      print(strinfo)
+      sys.exit(2)
+
+   for opt, arg in opts:
+      if opt == '-h':
+         print(strinfo)
+         sys.exit()
+      elif opt in ("-g"):
+         goldenPath = arg
+      elif opt in ("-d"):
+         workPath = arg
+      elif opt in ("-m"):
+         modes = arg.split(',')
+      elif opt in ("-t"):
+         pixelTol = float(arg)
+      elif opt in ("-f"):
+         fpsTol = float(arg)
+      elif opt in ("-w"):
+         writeGolden = True
+      elif opt in ("-N"):
+         allowMissing = True
+
+   for mode in modes:
+      if mode not in renderModes:
+         print('Unknown mode {0:s}\n{1:s}'.format(mode, strinfo))
+         sys.exit(2)
+   #the other modes are compared to the first one
+   if 'reference' in modes: modes.remove('reference')
+   modes.insert(0, 'reference')
+
+   if not (writeGolden or allowMissing or os.path.isfile(os.path.join(goldenPath, 'baseline.json'))):
+      print('FAIL: no golden baseline in {0:s}, store one with -w or run with -N'.format(goldenPath))
+      sys.exit(1)
+
+   frames = referenceFrames()
+   if not writeGolden and os.path.isfile(os.path.join(goldenPath, 'baseline.json')):
+      with open(os.path.join(goldenPath, 'baseline.json'), 'r') as jsonFile:
+         if json.load(jsonFile)['frames'] != frames:
+            print('FAIL: golden frames out of date, re-run with -w')
+            sys.exit(1)
+
+   tmpdir = None
+   if '' == workPath:
+      tmpdir = tempfile.mkdtemp(prefix='GLEGolden')
+      workPath = tmpdir
+
+   print('Reference frames', frames)
+   failures = []
+   fps = {}
+   try:
+      outdirs = {}
+      for mode in modes:
+         outdirs[mode], fps[mode] = renderMode(mode, workPath)
+         print('{0:s}: {1:.2f} frames/sec'.format(mode, fps[mode]))
+
+      if writeGolden:
+         os.makedirs(goldenPath, exist_ok=True)
+         for f in frames:
+            mpimg.imsave(os.path.join(goldenPath, '{0:04d}.png'.format(f)), readFrame('reference', outdirs['reference'], f))
+         with open(os.path.join(goldenPath, 'baseline.json'), 'w') as jsonFile:
+            json.dump({'frames': frames, 'fps': fps}, jsonFile, indent=1)
+         print('Golden frames and baseline written to', goldenPath)
+
+      baseline = None
+      if os.path.isfile(os.path.join(goldenPath, 'baseline.json')):
+         with open(os.path.join(goldenPath, 'baseline.json'), 'r') as jsonFile:
+            baseline = json.load(jsonFile)
+      else:
+         print('No golden baseline in {0:s}, comparing modes to reference only'.format(goldenPath))
+
+      for f in frames:
+         ref = readFrame('reference', outdirs['reference'], f)
+         if baseline is not None:
+            d = frameDiff(ref, mpimg.imread(os.path.join(goldenPath, '{0:04d}.png'.format(f))))
+            if d > pixelTol: failures.append('reference frame {0:d} drifted from golden (RMS {1:g})'.format(f, d))
+         for mode in modes[1:]:
+            d = frameDiff(ref, readFrame(mode, outdirs[mode], f))
+            if d > pixelTol: failures.append('{0:s} frame {1:d} differs from reference (RMS {2:g})'.format(mode, f, d))
+
+      if baseline is not None:
+         for mode in modes:
+            if mode not in baseline['fps']:
+               if not allowMissing: failures.append('{0:s} has no stored throughput baseline (store one with -w)'.format(mode))
+            elif fps[mode] < (1.-fpsTol)*baseline['fps'][mode]:
+               failures.append('{0:s} throughput {1:.2f} frames/sec below baseline {2:.2f}'.format(mode, fps[mode], baseline['fps'][mode]))
+   finally:
+      if tmpdir is not None: shutil.rmtree(tmpdir)
+
+   for failure in failures:
+      print('FAIL:', failure)
+   if failures:
+      sys.exit(1)
+   print('OK: {0:d} frames in {1:d} modes match'.format(len(frames), len(modes)))
+
+
+if __name__ == "__main__":
+   main(sys.argv[1:])
+
+
+
+#END
@@ -22,8 +22,16 @@
 # 1.9.0 Step plot for network aware. Option to exclude rates plot
 # 1.10.0 Interpret new GOES data format
 # 1.11.0 Formatting changes for GLE77
+# 1.12.0 Optional derived-products export replaces the GLETemp.csv dump
+# 1.13.0 Moving average and baselines computed from the rates with cumulative sums
+# 1.14.0 Several network scenarios from a config file rendered in one run
+# 1.15.0 Day archive so that windows can span midnight and several days
+# 1.16.0 Option to pack the frames of a run into one container file
+# 1.17.0 Long-run mode with figure recycling and memory tracking
 """
 import glob
+import io
+import tempfile
 from datetime import datetime, timedelta, timezone, date, time
 import time
 import numpy as np
@@ -34,9 +42,11 @@ import csv
 import json
 import sys
 import getopt
+import gc
 
 import os.path
 from os import path
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
@@ -50,6 +60,8 @@ import smtplib
 from email.message import EmailMessage
 from cycler import cycler
 
+import GLEFrameStore
+
 
 
 #######################################
@@ -71,6 +83,316 @@ __email__ = 'lucasb@udel.edu'
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
+def windowSums(values, first, last, ref=None):
+   """Sum and count of the non-NaN values in rows ref[i]-first..ref[i]-last for every row i.
+
+   values is a (rows, columns) array and ref defaults to i itself. Rows
+   whose window starts before the first row get a sum and count of 0.
+   Built on cumulative sums, so a single pass whatever the window length.
+   """
+   valid = ~np.isnan(values)
+   zero = np.zeros((1, values.shape[1]))
+   cumSum = np.vstack([zero, np.cumsum(np.where(valid, values, 0.), axis=0)])
+   cumCount = np.vstack([zero, np.cumsum(valid, axis=0)])
+
+   rows = np.arange(values.shape[0]) if ref is None else np.asarray(ref)
+   full = (rows-first) >= 0
+   lo = np.clip(rows-first, 0, None)
+   hi = np.clip(rows-last+1, 0, None)
+   sums = np.where(full[:, None], cumSum[hi]-cumSum[lo], 0.)
+   counts = np.where(full[:, None], cumCount[hi]-cumCount[lo], 0)
+   return sums, counts
+
+
+def rollingBaseline(df, tags, avgMinutes=3, baseStart=85, baseEnd=10):
+   """Moving average, baseline and increase of the <TAG>T rates for every row of df.
+
+   df holds one row per minute and a Status column. For each tag the
+   returned frame has <TAG>MA the avgMinutes moving average, <TAG>Base the
+   mean rate from baseStart to baseEnd minutes before the baseline
+   reference row, <TAG>Ith = MA/Base and <TAG>Inc the increase in percent.
+   The reference row is the one of the baseline markers (see
+   baselineReference), so the baseline stops moving once Alert is reached
+   and does not take in the increase. Rows without data in a window are NaN.
+   """
+   if avgMinutes < 1 or baseEnd < 0 or baseStart <= baseEnd:
+      raise ValueError('Invalid windows: average {0:d}, baseline {1:d}-{2:d} minutes'.format(avgMinutes, baseStart, baseEnd))
+   rates = df[[t+'T' for t in tags]].to_numpy(dtype=np.float64)
+
+   sums, counts = windowSums(rates, avgMinutes-1, 0)
+   with np.errstate(invalid='ignore', divide='ignore'):
+      ma = np.where(counts > 0, sums/counts, np.nan)
+   sums, counts = windowSums(rates, baseStart, baseEnd, baselineReference(df['Status'].to_numpy(), 0))
+   with np.errstate(invalid='ignore', divide='ignore'):
+      base = np.where(counts > 0, sums/counts, np.nan)
+      ith = ma/base
+
+   dfOut = pd.DataFrame(index=df.index)
+   for i, t in enumerate(tags):
+      dfOut[t+'MA'] = ma[:, i]
+      dfOut[t+'Base'] = base[:, i]
+      dfOut[t+'Ith'] = ith[:, i]
+      dfOut[t+'Inc'] = 100.*(ith[:, i]-1.)
+   return dfOut
+
+
+def baselineReference(status, first):
+   """Row the baseline window is counted back from, for every row.
+
+   It follows the previous row while its Status is below Alert and stays
+   frozen afterwards (missing Status counts as not below Alert). Rows
+   before any such row from first on refer to first.
+   """
+   rows = np.arange(len(status))
+   follow = np.where((rows >= first) & (np.asarray(status) < 3), rows, -1)
+   last = np.maximum.accumulate(follow)
+   ref = np.empty(len(status), dtype=int)
+   ref[0] = first
+   ref[1:] = np.maximum(last[:-1], first)
+   return ref
+
+
+def baselinePositions(status, initMinutes, baseStart=85, baseEnd=10):
+   """Row positions of the baseline markers shown at every frame row.
+
+   The markers follow the previous frame row while its Status is below
+   Alert and stay frozen afterwards. Before the first frame they refer to
+   initMinutes. Returns a (rows, 2) array of positions, negative ones
+   counting from the end of the window like df.index[].
+   """
+   ref = baselineReference(status, initMinutes)
+   return np.stack([ref-baseStart, ref-baseEnd], axis=1)
+
+
+def loadScenarios(fileName, nmdbtag):
+   """Read named network scenarios from a JSON file.
+
+   The file holds {"scenarios": [{"name": <name>, "groups": [{"label":
+   <legend label>, "stations": [<NMDB tag>, ...]}, ...]}, ...]}. A group
+   with "stations": "others" takes every station not used by the previous
+   groups of its scenario. Each scenario is rendered to its own <name>/
+   directory, so names must be unique and a station may only be in one
+   group of a scenario.
+   """
+   with open(fileName,'r') as jsonFile:
+      config = json.load(jsonFile)
+
+   scenarios = []
+   for sc in config['scenarios']:
+      if sc['name'] in ['', '.', '..'] or '/' in sc['name'] or (os.altsep is not None and os.altsep in sc['name']):
+         raise ValueError('Invalid scenario name {0!r}'.format(sc['name']))
+      if sc['name'] in [scenario['name'] for scenario in scenarios]:
+         raise ValueError('Duplicate scenario name {0:s}'.format(sc['name']))
+      scenario = {'name': sc['name'], 'path': sc['name']+'/', 'flags': [], 'labels': [], 'columns': []}
+      used = []
+      for k, group in enumerate(sc['groups']):
+         if 'others' == group['stations']:
+            stations = [tag for tag in nmdbtag if tag not in used]
+         else:
+            stations = group['stations']
+            for tag in stations:
+               if tag not in nmdbtag:
+                  raise ValueError('Unknown station {0:s} in scenario {1:s}'.format(tag, sc['name']))
+               if tag in used or stations.count(tag) > 1:
+                  raise ValueError('Station {0:s} listed more than once in scenario {1:s}'.format(tag, sc['name']))
+         used += stations
+         scenario['flags'].append([tag+'F' for tag in stations])
+         scenario['labels'].append(group['label'])
+         scenario['columns'].append('{0:s}_{1:d}_Above'.format(sc['name'], k+1))
+      scenarios.append(scenario)
+   return scenarios
+
+
+def networkCounts(df, scenarios):
+   """Add the number of stations above threshold of every scenario group to df.
+
+   All the groups are reduced together as one product of the station flag
+   matrix with a station-to-group membership matrix. Sets the 'ymaxAl'
+   axis maximum of each scenario.
+   """
+   flags = []
+   for scenario in scenarios:
+      for groupFlags in scenario['flags']:
+         flags += [f for f in groupFlags if f not in flags]
+   columns = [c for scenario in scenarios for c in scenario['columns']]
+
+   membership = np.zeros((len(flags), len(columns)), dtype=np.int64)
+   j = 0
+   for scenario in scenarios:
+      for groupFlags in scenario['flags']:
+         membership[[flags.index(f) for f in groupFlags], j] = 1
+         j += 1
+   counts = df[flags].fillna(0).to_numpy(dtype=np.int64) @ membership
+
+   for j, c in enumerate(columns):
+      df[c] = counts[:, j]
+   for scenario in scenarios:
+      scenario['ymaxAl'] = max(df[scenario['columns']].sum(axis=1).max(), 4)
+
+
+def drawNetwork(axesal, xAll, dfCur, scenario, colors):
+   """Draw the stations above threshold of a network scenario. Return the artists drawn."""
+   ymaxAl = scenario['ymaxAl']
+   axesal.set_ylim(0,ymaxAl+0.75)
+   artists = [axesal.fill_between(x=xAll, y1=0, y2=0.5, color='lightgrey', alpha=0.2),
+              axesal.fill_between(x=xAll, y1=0.5, y2=1.5, color='lightblue', alpha=0.2),
+              axesal.fill_between(x=xAll, y1=1.5, y2=2.5, color='lightyellow', alpha=0.2),
+              axesal.fill_between(x=xAll, y1=2.5, y2=ymaxAl+0.75, color='pink', alpha=0.2)]
+   #explicit colors so that every scenario starts the color cycle over
+   artists += axesal.stackplot(dfCur.index.values, [dfCur[c] for c in scenario['columns']] , step="post",
+                               labels=scenario['labels'], colors=[colors[k%len(colors)] for k in range(len(scenario['columns']))])
+   return artists
+
+
+def indexArchive(dirPath):
+   """Map the day covered by every GLE_Day_YYYYMMDD.csv of dirPath to its file name."""
+   archive = {}
+   for fileName in glob.glob(os.path.join(dirPath, 'GLE_Day_*.csv')):
+      try:
+         day = datetime.strptime(os.path.basename(fileName)[len('GLE_Day_'):-len('.csv')], '%Y%m%d').date()
+      except ValueError:
+         continue
+      archive[day] = fileName
+   return archive
+
+
+def readDay(fileName):
+   """Read one GLE day, reusing the Parquet copy next to the CSV when it is up to date.
+
+   The copy is only kept when pyarrow is available. It is written to a
+   temporary file and renamed into place, and an unreadable copy is
+   replaced from the CSV.
+   """
+   try:
+      import pyarrow
+   except ImportError:
+      pyarrow = None
+   cacheName = os.path.splitext(fileName)[0]+'.parquet'
+   if pyarrow is not None and os.path.isfile(cacheName) and os.path.getmtime(cacheName) >= os.path.getmtime(fileName):
+      try:
+         return pd.read_parquet(cacheName)
+      except Exception as err:
+         print('Cannot read {0:s} ({1}), reading the CSV'.format(cacheName, err))
+
+   df = pd.read_csv(fileName, sep=',',date_format='%y/%m/%d %H:%M:%S', index_col=0)
+   df=df.drop(columns=['Time.1'])
+   if pyarrow is not None:
+      try:
+         writeParquet(df, cacheName)
+      except OSError:
+         print('Cannot cache {0:s}'.format(fileName))   #read-only archive
+   return df
+
+
+def writeParquet(df, fileName, index=None):
+   """Write df to a Parquet file through a temporary file in the same directory.
+
+   The temporary file is renamed over fileName only once complete, so
+   other runs never read a partial file.
+   """
+   tmpFd, tmpName = tempfile.mkstemp(prefix='.'+os.path.basename(fileName), suffix='.tmp',
+                                     dir=os.path.dirname(fileName) or '.')
+   os.close(tmpFd)
+   try:
+      df.to_parquet(tmpName, index=index)
+      os.replace(tmpName, fileName)
+   except BaseException:
+      if os.path.isfile(tmpName): os.remove(tmpName)
+      raise
+
+
+def loadArchive(archive, startTime, endTime):
+   """Read in parallel the archived days overlapping startTime..endTime into one time-indexed frame.
+
+   The frame is put on a full 1-minute grid over these days, with missing
+   values where a day or minutes are missing, since the display and the
+   baseline windows count rows as minutes.
+   """
+   days = []
+   day = startTime.date()
+   while day <= endTime.date():
+      if day in archive:
+         days.append(day)
+      else:
+         print('No GLE data for {0:s}, shown as missing'.format(day.isoformat()))
+      day += timedelta(days=1)
+   if not days:
+      raise FileNotFoundError('No GLE_Day file from {0:s} to {1:s}'.format(startTime.isoformat(), endTime.isoformat()))
+
+   with ThreadPoolExecutor(max_workers=min(len(days), os.cpu_count() or 1)) as pool:
+      dfs = list(pool.map(readDay, [archive[day] for day in days]))
+   df = pd.concat(dfs) if len(dfs) > 1 else dfs[0]
+   df = df.loc[~df.index.duplicated(keep='first')].sort_index()
+
+   if (df.index != df.index.floor('min')).any():
+      raise ValueError('GLE data from {0:s} to {1:s} is not on a 1-minute grid'.format(startTime.isoformat(), endTime.isoformat()))
+   grid = pd.date_range(datetime.combine(startTime.date(), datetime.min.time()),
+                        datetime.combine(endTime.date(), datetime.min.time())+timedelta(days=1),
+                        freq='min', inclusive='left')
+   missing = len(grid)-len(df.index.intersection(grid))
+   if missing > 0:
+      print('{0:d} missing minutes from {1:s} to {2:s}'.format(missing, grid[0].isoformat(), grid[-1].isoformat()))
+   return df.reindex(grid)
+
+
+def currentRSS():
+   """Resident set size of this process in MB (peak size where /proc is not available)."""
+   try:
+      with open('/proc/self/statm','r') as statm:
+         return int(statm.read().split()[1])*os.sysconf('SC_PAGE_SIZE')/2**20
+   except (OSError, ValueError, IndexError):
+      import resource
+      rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+      return rss/2**20 if 'darwin' == sys.platform else rss/2**10
+
+
+def writeDerived(Outpath, event, dfFrames, scenarios, alarmLines, Status):
+   """Write the per-frame network counts and alarm transition times of one event.
+
+   One Parquet file per event is written in GLEDerived/frames and
+   GLEDerived/alarms under Outpath, so that pd.read_parquet() on either
+   directory reads all the events at once. The counts are in long format,
+   one row per frame and scenario group (Event, Time, Frame, Status,
+   Scenario, Group, Label, Count), so that events rendered with different
+   scenarios share the same columns. Without scenarios, one row per frame
+   is written with empty Scenario, Group, Label and Count.
+   """
+   derivedPath = os.path.join(Outpath, 'GLEDerived')
+   os.makedirs(os.path.join(derivedPath, 'frames'), exist_ok=True)
+   os.makedirs(os.path.join(derivedPath, 'alarms'), exist_ok=True)
+
+   nFrames = len(dfFrames)
+   dfGroups = []
+   for scenario in scenarios:
+      for k, (label, c) in enumerate(zip(scenario['labels'], scenario['columns'])):
+         dfGroups.append(pd.DataFrame({'Event': event,
+                                       'Time': dfFrames.index,
+                                       'Frame': np.arange(nFrames, dtype=np.int32),
+                                       'Status': dfFrames['Status'].astype('Int8').array,
+                                       'Scenario': scenario['name'],
+                                       'Group': np.int8(k+1),
+                                       'Label': label,
+                                       'Count': dfFrames[c].to_numpy().astype(np.int16)}))
+   if not dfGroups:
+      dfGroups.append(pd.DataFrame({'Event': event,
+                                    'Time': dfFrames.index,
+                                    'Frame': np.arange(nFrames, dtype=np.int32),
+                                    'Status': dfFrames['Status'].astype('Int8').array,
+                                    'Scenario': pd.array([None]*nFrames, dtype='string'),
+                                    'Group': pd.array([None]*nFrames, dtype='Int8'),
+                                    'Label': pd.array([None]*nFrames, dtype='string'),
+                                    'Count': pd.array([None]*nFrames, dtype='Int16')}))
+   dfOut = pd.concat(dfGroups, ignore_index=True)
+   writeParquet(dfOut, os.path.join(derivedPath, 'frames', '{0:s}.parquet'.format(event)), index=False)
+
+   dfAlarms = pd.DataFrame({'Event': event,
+                            'Level': np.arange(1, len(alarmLines)+1, dtype=np.int8),
+                            'Name': Status[1:len(alarmLines)+1],
+                            'Time': alarmLines})
+   writeParquet(dfAlarms, os.path.join(derivedPath, 'alarms', '{0:s}.parquet'.format(event)), index=False)
+   print('Derived products for event {0:s} written to {1:s}'.format(event, derivedPath))
+
+
 def main(argv):
    start_exetime = time.time()
 
@@ -86,6 +408,17 @@ def main(argv):
    fileGOESProton =''
    fileGOESXray ='' 
    showBaselines = False
+   exportDerived = False
+   frameContainer = False
+   longRunInterval = 0   #frames between figure recycling and memory records, 0 for off
+   rssLimit = 0.         #RSS growth warning threshold [MB], 0 for off
+   restartWorker = False
+   firstFrame = 0
+   scenarioFile = ''
+   rawBaseline = False
+   avgMinutes = 3    #moving average [min]
+   baseStart = 85    #baseline window start before the frame [min]
+   baseEnd = 10      #baseline window end before the frame [min]
    alarmLineGPShow = True
    xTickMajorHours = 1
 
@@ -97,14 +430,23 @@ def main(argv):
    strinfo=strinfo+'-i <input path>\n'
    strinfo=strinfo+'-o <output path> (output path is the same as input path if not given)\n'
    strinfo=strinfo+'-r <replay day> (in valid ISO 8601 format like YYYY-MM-DD)\n'
-   strinfo=strinfo+'-s <minutes>\n'
-   strinfo=strinfo+'-e <minutes>\n'
+   strinfo=strinfo+'-s <minutes> (from the start of the replay day)\n'
+   strinfo=strinfo+'-e <minutes> (from the start of the replay day, above 1440 continues on the next days)\n'
    strinfo=strinfo+'-p <GOES Proton file>\n'
    strinfo=strinfo+'-x <GOES X-ray file>\n'
    strinfo=strinfo+'-b (show baseline)\n'
+   strinfo=strinfo+'-d (export derived products to <output path>/GLEDerived, needs pyarrow)\n'
+   strinfo=strinfo+'-a (recompute moving average and baseline from the rates instead of the Ith columns)\n'
+   strinfo=strinfo+'-w <average>,<baseline start>,<baseline end> (with -a, window lengths in minutes, default 3,85,10)\n'
+   strinfo=strinfo+'-n <network scenario file> (JSON, one video per scenario in <output path>/YYYYMMDD/<name>)\n'
+   strinfo=strinfo+'-k (write the frames to one GLE_YYYYMMDD_HHMM.zip container instead of PNG files)\n'
+   strinfo=strinfo+'-l <frames> (long run: new figure and memory/time record every <frames> frames)\n'
+   strinfo=strinfo+'-M <MB> (with -l, warn when memory grows by more than <MB>)\n'
+   strinfo=strinfo+'-R (with -M, restart the script from the next frame instead of warning)\n'
+   strinfo=strinfo+'-F <frame> (start at this frame number)\n'
 
    try:
-      opts, args = getopt.getopt(argv,"hr:s:e:i:o:p:x:b")
+      opts, args = getopt.getopt(argv,"hr:s:e:i:o:p:x:bdaw:n:kl:M:RF:")
    except getopt.GetoptError:
       print(strinfo)
       sys.exit(2)
@@ -131,12 +473,48 @@ def main(argv):
          fileGOESXray = arg     #GOES X-ray file
       elif opt in ("-b"):
          showBaselines = True     #graph baselines
+      elif opt in ("-d"):
+         exportDerived = True     #write derived products
+      elif opt in ("-a"):
+         rawBaseline = True     #Ith from the rates
+      elif opt in ("-w"):
+         avgMinutes, baseStart, baseEnd = [int(w) for w in arg.split(',')]
+      elif opt in ("-n"):
+         scenarioFile = arg     #network scenarios
+      elif opt in ("-k"):
+         frameContainer = True     #single frame container
+      elif opt in ("-l"):
+         longRunInterval = int(arg)     #long run mode
+      elif opt in ("-M"):
+         rssLimit = float(arg)     #memory growth threshold
+      elif opt in ("-R"):
+         restartWorker = True     #restart on memory growth
+      elif opt in ("-F"):
+         firstFrame = int(arg)     #resume frame
 
 
    if len(opts) <  1:
       print('For information: GLEGraphVid.py -h')
       sys.exit(2)
 
+   if (rssLimit > 0 or restartWorker) and 0 == longRunInterval:
+      print('-M and -R need the long-run mode -l')
+      sys.exit(2)
+   if restartWorker and 0 == rssLimit:
+      print('-R needs a memory growth threshold -M')
+      sys.exit(2)
+
+   if ('-w' in [opt for opt, arg in opts]) and not rawBaseline:
+      print('-w only applies to the moving average and baseline recomputed with -a')
+      sys.exit(2)
+
+   if exportDerived:
+      try:
+         import pyarrow
+      except ImportError:
+         print('-d needs pyarrow to write Parquet files')
+         sys.exit(2)
+
    ########################
    #Data frame
    ########################
@@ -159,6 +537,14 @@ def main(argv):
    intlFlags = list(filter(lambda x: x not in extendedFlags, intlFlags))
    print(intlFlags)  #DEBUG
 
+   if '' == scenarioFile:
+      scenarios = [{'name': 'GLE77', 'path': '',
+                    'flags': [bartolFlags, extendedFlags, intlFlags],
+                    'labels': ['Prototype', '+ Simpson Network', '+ Mawson'],
+                    'columns': ['Bartol_Above','Extended_Above','Intl_Above']}]
+   else:
+      scenarios = loadScenarios(scenarioFile, nmdbtag)
+
    #History from Makejson_ql.py
    #History= [0.597135,(0.598/0.94696),1.35333,0.59686,0.54518,0.57732*0.6,0.705,0.52308,0.52308]
    History= [0.597135,0.598,1.35333,0.59686,0.54518,0.57732*0.6,0.52308,0.52308,0.705,0.6,0.6,0.6,0.6,0.6,0.6]
@@ -172,12 +558,20 @@ def main(argv):
    networkAwareAlert = True
    ratePlot = False
 
+   startTime=datetime.combine(startDay, datetime.min.time())+timedelta(minutes=startMinutes)
+   # print(startTime)  #DEBUG
+   endTime=datetime.combine(startDay, datetime.min.time())+timedelta(minutes=endMinutes)
+   print('Graph x-axis from',startTime, 'to', endTime)
+
+   #only the days of the window, and of the baseline before it when recomputed
+   loadStart = startTime
+   if rawBaseline: loadStart -= timedelta(minutes=baseStart+avgMinutes)
    # df = pd.read_csv('{0:s}/GLE_Day_{1:s}.txt'.format(
-   df = pd.read_csv('{0:s}/GLE_Day_{1:s}.csv'.format(
-                     Outpath,startDay.strftime("%Y%m%d")),
-                     sep=',',date_format='%y/%m/%d %H:%M:%S',
-                     index_col=0)
-   df=df.drop(columns=['Time.1'])
+   df = loadArchive(indexArchive(Outpath), loadStart, endTime)
+   if rawBaseline:
+      dfBase = rollingBaseline(df, nmdbtag, avgMinutes, baseStart, baseEnd)
+      for tag in nmdbtag:
+         df[tag+'Ith'] = dfBase[tag+'Ith']
    # print(df)  #DEBUG
    # print(df.info(verbose=True, show_counts=True))  #DEBUG
 
@@ -207,11 +601,8 @@ def main(argv):
    # print(Fact)
    # sys.exit() #DEBUG
 
-
-   startTime=datetime.combine(startDay, datetime.min.time())+timedelta(minutes=startMinutes)
-   # print(startTime)  #DEBUG
-   endTime=datetime.combine(startDay, datetime.min.time())+timedelta(minutes=endMinutes)
-   print('Graph x-axis from',startTime, 'to', endTime)
+   if (endMinutes-startMinutes) > 1440:
+      xTickMajorHours = 6   #multi-day overview
 
    df = df[startTime:endTime]
    # df = df[startTime:(endTime+timedelta(minutes=1))]
@@ -445,343 +836,403 @@ def main(argv):
       pG+=1
 
    if networkAwareAlert :
-      df['Bartol_Above']= df[bartolFlags].sum(axis=1)
-      print(df['Bartol_Above'].max())  #DEBUG
-      print(df['Bartol_Above'])  #DEBUG
-      df['Extended_Above']= df[extendedFlags].sum(axis=1)
-      print(df['Extended_Above'].max())  #DEBUG
-      df['Intl_Above']= df[intlFlags].sum(axis=1)
-      print(df['Intl_Above'].max())  #DEBUG
-      ymaxAl = df[['Bartol_Above','Extended_Above','Intl_Above']].sum(axis=1).max()
-      ymaxAl = max(ymaxAl,4)
-      print("Max Flags = {0:d}".format(ymaxAl))  #DEBUG
-
-      df.to_csv('./GLETemp.csv')  #DEBUG
+      networkCounts(df, scenarios)
+      for scenario in scenarios:
+         for c in scenario['columns']:
+            print(c, df[c].max())  #DEBUG
+         print("{0:s} Max Flags = {1:d}".format(scenario['name'], scenario['ymaxAl']))  #DEBUG
+         if '' != scenario['path']:
+            os.makedirs('{0:s}/{1:s}/{2:s}'.format(Outpath, startTime.strftime("%Y%m%d"), scenario['path']), exist_ok=True)
+   else:
+      scenarios = scenarios[:1]
+
+   if exportDerived:
+      writeDerived(Outpath, startTime.strftime('%Y%m%d_%H%M'),
+                   df.iloc[initMinutes:(endMinutes+1)-startMinutes], scenarios if networkAwareAlert else [], alarmLines, Status)
 
    # pAll=5+pG
    pAll=3+pG+pT
    LastStatus=0
    fig=plt.figure(figsize=(14, 11), dpi=80)
-   if showBaselines: baselines = [df.index[initMinutes-85],df.index[initMinutes-10] ]
+   if frameContainer:
+      frameStores = [GLEFrameStore.openStore('{0:s}/{1:s}/{2:s}GLE_{3:s}.zip'.format(
+                        Outpath, startTime.strftime("%Y%m%d"), scenario['path'], startTime.strftime('%Y%m%d_%H%M')),
+                        append=(firstFrame > 0))
+                     for scenario in scenarios]
+   if longRunInterval > 0:
+      longRunFile = open('{0:s}/{1:s}/GLE_{2:s}_longrun.csv'.format(
+                           Outpath, startTime.strftime("%Y%m%d"), startTime.strftime('%Y%m%d_%H%M')),
+                         'a' if firstFrame > 0 else 'w', newline='')
+      longRunLog = csv.writer(longRunFile)
+      if 0 == firstFrame: longRunLog.writerow(['Frame','Time','Seconds per frame','RSS [MB]'])
+      rssStart = None   #taken after the first interval, once the caches are warm
+      intervalStart = time.perf_counter()
+   if showBaselines: baselineRows = baselinePositions(df['Status'].to_numpy(), initMinutes, baseStart, baseEnd)
    
    # print(yminT,ymaxT,yminI,ymaxI,yminGP,ymaxGP,yminGX,ymaxGX) #DEBUG
    # print(df.index[(endMinutes)-startMinutes]) #DEBUG
 
    # print(df) #DEBUG
    # print (df.index[0],df.index[-1]) #DEBUG
-   for r in range(initMinutes, (endMinutes+1)-startMinutes) :
-   # for r in range(initMinutes, endMinutes-startMinutes) :
-      # print(df.index[r]) #DEBUG
-   # for r in range(endMinutes-startMinutes-1, endMinutes-startMinutes) :
-
-      # dfCur=df.iloc[0:r]
-      dfCur=df.iloc[0:(r+1)]
-      # print(len(dfCur)) #DEBUG
-      # print(dfCur.index[-1]) #DEBUG
-
-      if lenGP>0:
-         dfGPCur = dfGP[startTime:dfCur.index.values[-1]]
-         # print(dfGPCur)  #DEBUG
-         # print(dfGPCur.info(verbose=True, show_counts=True))  #DEBUG
-      if lenGX>0:
-         dfGXCur = dfGX[startTime:dfCur.index.values[-1]]
-         # print(dfGXCur)  #DEBUG
-         # print(dfGXCur.info(verbose=True, show_counts=True))  #DEBUG
-
-      # axes = fig.add_subplot(5,1,(4,5),sharex=axesT)
-      axes = fig.add_subplot(pAll,1,(pAll-1,pAll))
-
-
-      for i in range(N):
-         axes.plot(dfCur.index.values,100.*(dfCur[nmdbtag[i]+'Ith']-1.),'-',linewidth=0.8,label='{0:s}'.format(Labels[i]))
-      for i in range(N,Nall):
-         if(0 < dfCur[nmdbtag[i]+'Ith'].count()): 
+   try:
+      frameNum = firstFrame
+      for r in range(initMinutes+firstFrame, (endMinutes+1)-startMinutes) :
+      # for r in range(initMinutes, endMinutes-startMinutes) :
+         # print(df.index[r]) #DEBUG
+      # for r in range(endMinutes-startMinutes-1, endMinutes-startMinutes) :
+
+         # dfCur=df.iloc[0:r]
+         dfCur=df.iloc[0:(r+1)]
+         # print(len(dfCur)) #DEBUG
+         # print(dfCur.index[-1]) #DEBUG
+
+         if lenGP>0:
+            dfGPCur = dfGP[startTime:dfCur.index.values[-1]]
+            # print(dfGPCur)  #DEBUG
+            # print(dfGPCur.info(verbose=True, show_counts=True))  #DEBUG
+         if lenGX>0:
+            dfGXCur = dfGX[startTime:dfCur.index.values[-1]]
+            # print(dfGXCur)  #DEBUG
+            # print(dfGXCur.info(verbose=True, show_counts=True))  #DEBUG
+
+         # axes = fig.add_subplot(5,1,(4,5),sharex=axesT)
+         axes = fig.add_subplot(pAll,1,(pAll-1,pAll))
+
+
+         for i in range(N):
             axes.plot(dfCur.index.values,100.*(dfCur[nmdbtag[i]+'Ith']-1.),'-',linewidth=0.8,label='{0:s}'.format(Labels[i]))
+         for i in range(N,Nall):
+            if(0 < dfCur[nmdbtag[i]+'Ith'].count()): 
+               axes.plot(dfCur.index.values,100.*(dfCur[nmdbtag[i]+'Ith']-1.),'-',linewidth=0.8,label='{0:s}'.format(Labels[i]))
 
 
-      axes.xaxis.set_major_locator(mdates.HourLocator(interval=xTickMajorHours))
-      axes.xaxis.set_minor_locator(mdates.MinuteLocator(byminute=range(0,xTickMajorHours*60,xTickMajorHours*15)))
-      axes.xaxis.set_major_formatter(mdates.DateFormatter('%Y/%m/%d\n%H:%M'))
+         axes.xaxis.set_major_locator(mdates.HourLocator(interval=xTickMajorHours))
+         if 1 == xTickMajorHours:
+            axes.xaxis.set_minor_locator(mdates.MinuteLocator(byminute=range(0,xTickMajorHours*60,xTickMajorHours*15)))
+         else:
+            axes.xaxis.set_minor_locator(mdates.HourLocator())
+         axes.xaxis.set_major_formatter(mdates.DateFormatter('%Y/%m/%d\n%H:%M'))
       
 
-      # plt.tick_params(axis='x', which='major', labelsize=fontsize+1,direction='in',length=6)
-      # plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
-      plt.tick_params(axis='x', which='major', labelsize=fontsize+1,direction='out',length=6)
-      plt.tick_params(axis='x', which='minor', labelsize=0,direction='out',length=3)
-      plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
-      # plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
-
-      ###axes.set_xlim(now - timedelta(hours=8),now)
-      # axes.set_xlim(startTime,endTime)
-      axes.set_xlim(df.index[0],df.index[-1])
-      # if (0==yminI):
-      #    axes.set_ylim(yminI,(1+limMargin)*ymaxI)
-      # else:
-      #    axes.set_ymargin(limMargin)
-         # axes.set_ylim(yminI,ymaxI)
-      axes.set_ylim(yminI,ymaxI)
-      # axes.set_ylim(yminI,ymaxI-0.001)
-      axes.set_ylabel('Rate increase [%]\n3-min moving average',fontsize=fontsize+1)
-      # axes.axhline(y=dfCur.iloc[-1]['Status'],linewidth=0.5,linestyle='-',color='red')
-      # axes.axhline(y=Level,linewidth=0.5,linestyle='-',color='red')
+         # plt.tick_params(axis='x', which='major', labelsize=fontsize+1,direction='in',length=6)
+         # plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
+         plt.tick_params(axis='x', which='major', labelsize=fontsize+1,direction='out',length=6)
+         plt.tick_params(axis='x', which='minor', labelsize=0,direction='out',length=3)
+         plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
+         # plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
+
+         ###axes.set_xlim(now - timedelta(hours=8),now)
+         # axes.set_xlim(startTime,endTime)
+         axes.set_xlim(df.index[0],df.index[-1])
+         # if (0==yminI):
+         #    axes.set_ylim(yminI,(1+limMargin)*ymaxI)
+         # else:
+         #    axes.set_ymargin(limMargin)
+            # axes.set_ylim(yminI,ymaxI)
+         axes.set_ylim(yminI,ymaxI)
+         # axes.set_ylim(yminI,ymaxI-0.001)
+         axes.set_ylabel('Rate increase [%]\n{0:d}-min moving average'.format(avgMinutes),fontsize=fontsize+1)
+         # axes.axhline(y=dfCur.iloc[-1]['Status'],linewidth=0.5,linestyle='-',color='red')
+         # axes.axhline(y=Level,linewidth=0.5,linestyle='-',color='red')
       
 
-      plt.grid(axis='both',which='both',linewidth=0.5,linestyle=':',color='gray')
-      plt.legend(bbox_to_anchor=(1.01,0.525), loc="center left", borderaxespad=0,
-               fontsize=fontsize,labelspacing=0.0,frameon=False)
-      #plt.title('GLE Alarm from Bartol Neutron Monitors - Last update: {0:s} {1:s} {2:s} UT'.format(now.strftime("%Y-%m-%d"),r'$@$',now.strftime("%H:%M:%S")),fontsize=fontsize)
-      # plt.title('GLE Alarm from Bartol Neutron Monitors - Last update: {0:s} UT'.format(dfCur.index.values[-1]),fontsize=fontsize)
+         plt.grid(axis='both',which='both',linewidth=0.5,linestyle=':',color='gray')
+         plt.legend(bbox_to_anchor=(1.01,0.525), loc="center left", borderaxespad=0,
+                  fontsize=fontsize,labelspacing=0.0,frameon=False)
+         #plt.title('GLE Alarm from Bartol Neutron Monitors - Last update: {0:s} {1:s} {2:s} UT'.format(now.strftime("%Y-%m-%d"),r'$@$',now.strftime("%H:%M:%S")),fontsize=fontsize)
+         # plt.title('GLE Alarm from Bartol Neutron Monitors - Last update: {0:s} UT'.format(dfCur.index.values[-1]),fontsize=fontsize)
 
-      axes.text(axes.get_xlim()[1] + 0.19*(axes.get_xlim()[1] -axes.get_xlim()[0] ) ,
-               axes.get_ylim()[0]+ 0.0*(axes.get_ylim()[1] -axes.get_ylim()[0] ),
-               Notused, horizontalalignment='left', fontsize=fontsize-2,zorder=10)
+         axes.text(axes.get_xlim()[1] + 0.19*(axes.get_xlim()[1] -axes.get_xlim()[0] ) ,
+                  axes.get_ylim()[0]+ 0.0*(axes.get_ylim()[1] -axes.get_ylim()[0] ),
+                  Notused, horizontalalignment='left', fontsize=fontsize-2,zorder=10)
 
-      if (ratePlot):
-         # axesT = fig.add_subplot(5,1,(2,3))
-         axesT = fig.add_subplot(pAll,1,(pAll-3,pAll-2),sharex=axes)
-         # axesT = fig.add_subplot(pAll,1,(pAll-2,pAll-1))
+         if (ratePlot):
+            # axesT = fig.add_subplot(5,1,(2,3))
+            axesT = fig.add_subplot(pAll,1,(pAll-3,pAll-2),sharex=axes)
+            # axesT = fig.add_subplot(pAll,1,(pAll-2,pAll-1))
 
-         for i in range(N):
-            # axesT.plot(df['Time'],Fact[i]*df[nmdbtag[i]+'T'],'-',linewidth=0.8,label=r'{0:s} {1:s}'.format(Labels[i],sFact[i]))
-            axesT.plot(dfCur.index.values,Fact[i]*dfCur[nmdbtag[i]+'T'],'-',linewidth=0.8,label='{0:s} {1:s}'.format(Labels[i],sFact[i]))
-            # if df[nmdbtag[i]+'T'].max()>ymax: ymax=df[nmdbtag[i]+'T'].max()
-            # if df[nmdbtag[i]+'T'].min()<ymin: ymin=df[nmdbtag[i]+'T'].min()
-         for i in range(N,Nall):
-            if(0 < dfCur[nmdbtag[i]+'T'].count()): 
+            for i in range(N):
+               # axesT.plot(df['Time'],Fact[i]*df[nmdbtag[i]+'T'],'-',linewidth=0.8,label=r'{0:s} {1:s}'.format(Labels[i],sFact[i]))
                axesT.plot(dfCur.index.values,Fact[i]*dfCur[nmdbtag[i]+'T'],'-',linewidth=0.8,label='{0:s} {1:s}'.format(Labels[i],sFact[i]))
+               # if df[nmdbtag[i]+'T'].max()>ymax: ymax=df[nmdbtag[i]+'T'].max()
+               # if df[nmdbtag[i]+'T'].min()<ymin: ymin=df[nmdbtag[i]+'T'].min()
+            for i in range(N,Nall):
+               if(0 < dfCur[nmdbtag[i]+'T'].count()): 
+                  axesT.plot(dfCur.index.values,Fact[i]*dfCur[nmdbtag[i]+'T'],'-',linewidth=0.8,label='{0:s} {1:s}'.format(Labels[i],sFact[i]))
                
 
 
-         # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
-         # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
-         # plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
-
-         # axesT.xaxis.set_major_locator(mdates.HourLocator(interval=xTickMajorHours))
-         # axesT.xaxis.set_minor_locator(mdates.MinuteLocator(byminute=range(0,xTickMajorHours*60,xTickMajorHours*15)))
-         # axesT.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d\n%H:%M'))
-         # axesT.set_xlim(now - timedelta(hours=12),now)
-         # axesT.set_xlim(startTime,endTime)
-         # if (0==yminT):
-         #    axesT.set_ylim(yminT,(1.+limMargin)*ymaxT)
-         # else:
-         #    axesT.set_ymargin(limMargin)
-         #    axesT.set_ylim(yminT,ymaxT)
-         axesT.set_ylim(yminT,ymaxT)
-         # axesT.set_ylim(yminT,ymaxT-1)
-         axesT.set_ylabel('Rate [count / minute]\n3-min moving average',fontsize=fontsize+1)
-         plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
-         plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
-         plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
-
-         plt.grid(axis='both',which='both',linewidth=0.5,linestyle=':',color='gray')
+            # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
+            # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
+            # plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
 
-         plt.legend(bbox_to_anchor=(1.01,0.525), loc="center left", borderaxespad=0,
-                  fontsize=fontsize,labelspacing=0.0,frameon=False)
-         # plt.title('GLE Alarm from Bartol Neutron Monitors - {0:s} UT'.format(dfCur.index.values[-1]),fontsize=fontsize)
-         # plt.title('GLE Alarm from Bartol Neutron Monitors - {0:s} {1:s} {2:s} UT'.format(df.index.values[r],r'$@$',r.strftime("%H:%M:%S")),fontsize=fontsize)
-
-
-      # axesal = fig.add_subplot(5,1,(1,1),sharex=axes)
-      # axesal = fig.add_subplot(pAll,1,(pAll-4,pAll-4),sharex=axesT)
-      axesal = fig.add_subplot(pAll,1,(pAll-(2+pT),pAll-(2+pT)),sharex=axes)
-      dfStatus = dfCur[dfCur['Status']==3]
-      # print(dfStatus) #DEBUG
-      # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
-      # plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
-      # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=0)
-      # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
-      if networkAwareAlert :
-         # axesal.bar(df.index.values, df['Bartol_Above'], label='Bartol Simpson')
-         # axesal.plot(df.index.values, df['Bartol_Above'], label='Bartol Simpson')
-         axesal.set_ylim(0,ymaxAl+0.75)
-         axesal.fill_between(x=df.index.values, y1=0, y2=0.5, color='lightgrey', alpha=0.2)
-         axesal.fill_between(x=df.index.values, y1=0.5, y2=1.5, color='lightblue', alpha=0.2)
-         axesal.fill_between(x=df.index.values, y1=1.5, y2=2.5, color='lightyellow', alpha=0.2)
-         axesal.fill_between(x=df.index.values, y1=2.5, y2=ymaxAl+0.75, color='pink', alpha=0.2)
-         # axesal.stackplot(dfCur.index.values, [dfCur['Bartol_Above'],dfCur['Extended_Above'],dfCur['Intl_Above']] , step="post", labels=['Current', 'Full Simpson', 'International'])
-         axesal.stackplot(dfCur.index.values, [dfCur['Bartol_Above'],dfCur['Extended_Above'],dfCur['Intl_Above']] , step="post", labels=['Prototype', '+ Simpson Network', '+ Mawson'])
-         # axesal.stackplot(dfCur.index.values, [dfCur['Bartol_Above'],dfCur['Extended_Above']] , labels=['Bartol Simpson', 'Extended Simpson'])
-         # axesal.bar(dfCur.index.values, dfCur['Bartol_Above'],label='Bartol Simpson')
-         # axesal.bar(df.index.values, df['Bartol_Above'], bottom=df['Bartol_Above'], label='Extended Simpson')
-         # axesal.bar(df.index.values, df['Bartol_Above'], bottom=df['Bartol_Above']+df['Extended_Above'], label='International')
-      else :
-         
-         axesal.plot(dfStatus.index.values,3*np.ones(len(dfStatus)),'o',color='red',label=Status[3])
-         dfStatus = dfCur[dfCur['Status']==2]
-         # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
-         # plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
-         # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
-         axesal.plot(dfStatus.index.values,2*np.ones(len(dfStatus)),'o',color='orange',label=Status[2])
-         dfStatus = dfCur[dfCur['Status']==1]
-         # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
-         # plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
-         # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
-         axesal.plot(dfStatus.index.values,1*np.ones(len(dfStatus)),'o',color='blue',label=Status[1])
-         dfStatus = dfCur[dfCur['Status']==0]
+            # axesT.xaxis.set_major_locator(mdates.HourLocator(interval=xTickMajorHours))
+            # axesT.xaxis.set_minor_locator(mdates.MinuteLocator(byminute=range(0,xTickMajorHours*60,xTickMajorHours*15)))
+            # axesT.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d\n%H:%M'))
+            # axesT.set_xlim(now - timedelta(hours=12),now)
+            # axesT.set_xlim(startTime,endTime)
+            # if (0==yminT):
+            #    axesT.set_ylim(yminT,(1.+limMargin)*ymaxT)
+            # else:
+            #    axesT.set_ymargin(limMargin)
+            #    axesT.set_ylim(yminT,ymaxT)
+            axesT.set_ylim(yminT,ymaxT)
+            # axesT.set_ylim(yminT,ymaxT-1)
+            axesT.set_ylabel('Rate [count / minute]\n3-min moving average',fontsize=fontsize+1)
+            plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
+            plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
+            plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
+
+            plt.grid(axis='both',which='both',linewidth=0.5,linestyle=':',color='gray')
+
+            plt.legend(bbox_to_anchor=(1.01,0.525), loc="center left", borderaxespad=0,
+                     fontsize=fontsize,labelspacing=0.0,frameon=False)
+            # plt.title('GLE Alarm from Bartol Neutron Monitors - {0:s} UT'.format(dfCur.index.values[-1]),fontsize=fontsize)
+            # plt.title('GLE Alarm from Bartol Neutron Monitors - {0:s} {1:s} {2:s} UT'.format(df.index.values[r],r'$@$',r.strftime("%H:%M:%S")),fontsize=fontsize)
+
+
+         # axesal = fig.add_subplot(5,1,(1,1),sharex=axes)
+         # axesal = fig.add_subplot(pAll,1,(pAll-4,pAll-4),sharex=axesT)
+         axesal = fig.add_subplot(pAll,1,(pAll-(2+pT),pAll-(2+pT)),sharex=axes)
+         dfStatus = dfCur[dfCur['Status']==3]
+         # print(dfStatus) #DEBUG
          # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
          # plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
+         # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=0)
          # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
-         axesal.plot(dfStatus.index.values,0*np.ones(len(dfStatus)),'o',color='gray',label=Status[0])
-         axesal.set_ylim(0,3.75)
-         # axesal.set_ylabel('Alarm Level',fontsize=fontsize+1)
-         axesal.set_ylabel('Alarm Level',fontsize=fontsize)
-
-      plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
-      plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
-      # plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
-      # plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
-      # axesal.plot(df[df['Status']==3]['Time'],3*np.ones(len(df[df['Status']==3])),'o',color='red',label=Status[3])
-      # axesal.plot(df[df['Status']==2]['Time'],2*np.ones(len(df[df['Status']==2])),'o',color='orange',label=Status[2])
-      # axesal.plot(df[df['Status']==1]['Time'],1.*np.ones(len(df[df['Status']==1])),'o',color='blue',label=Status[1])
-      # axesal.plot(df[df['Status']==0]['Time'],0*np.ones(len(df[df['Status']==0])),'o',color='gray',label=Status[0])
-      # axesal.set_ylabel('Alarm Level',fontsize=fontsize+1)
-      plt.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
-               fontsize=fontsize,labelspacing=0.5,frameon=False)
-
-      # print(axes.get_xticklabels())  #DEBUG
-      if lenGP > 0:
-         # axesGP = fig.add_subplot(pAll,1,(pAll-5,pAll-5),sharex=axesT)
-         axesGP = fig.add_subplot(pAll,1,(pAll-(3+pT),pAll-(3+pT)),sharex=axes)
-         axesGP.set_ylim(yminGP,ymaxGP)
-         # axesGP.yaxis.set_minor_locator(subs='auto')
-         axesGP.set_yscale('log')
-         # axesGP.yaxis.set_minor_locator(mticker.LogLocator( numticks=10, subs='auto'))
-         # print(axesGP.yaxis.get_tick_space()) #DEBUG
-         llGP=mticker.LogLocator(base=10.0, numticks=int(math.ceil(ydeltaGP)))#subs=np.arange(2, 10) * 0.1)
-         llmGP=mticker.LogLocator(base=10.0, numticks=int(math.ceil(ydeltaGP))*9, subs='auto')#subs=np.arange(2, 10) * 0.1)
-         axesGP.yaxis.set_major_locator(llGP)
-         axesGP.yaxis.set_minor_locator(llmGP)
-         # axesGP.yaxis.set_minor_formatter(mticker.LogFormatterMathtext(base=10.0,  labelOnlyBase=False))
-         axesGP.yaxis.set_major_formatter(mticker.LogFormatterMathtext(base=10.0,  labelOnlyBase=False,minor_thresholds=(0, 0)))
-         # print(axesGP.get_yticks()) #DEBUG
-         axesGP.plot(dfGPCur.index.values,dfGPCur['p3_flux_ic'],color='darkred',label='>=10 MeV')
-         axesGP.plot(dfGPCur.index.values,dfGPCur['p7_flux_ic'],color='darkblue',label='>=100 MeV')
-         # axesGP.plot(df500['time_tag2'].to_numpy(),df500['flux'].to_numpy(),color='pink',label='>=500 MeV')
-         # axesGP.set_ymargin(10*limMargin)
-         # axesGP.yaxis.set_major_locator(mticker.LogLocator(  subs='auto'))
-         axesGP.set_ylabel('GOES\n Particles\n cm$^{-2}$s$^{-1}$sr$^{-1}$ ',fontsize=fontsize,color='k', multialignment='center')
-         plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
-         plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
-         plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
-         plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
-         # print(axesGP.yaxis.get_tick_params(which='minor')) #DEBUG
-         plt.grid(axis='x',which='major',linewidth=0.5,linestyle='-',color='gray')
-         plt.grid(axis='x',which='minor',linewidth=0.5,linestyle=':',color='gray')
-         plt.grid(axis='y',which='major',linewidth=0.5,linestyle=':',color='gray')
-         # plt.legend(loc='upper right',fontsize=fontsize,ncol=1)
-         plt.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
-               fontsize=fontsize,labelspacing=0.5,frameon=False)
-         # print(ymaxGP) #DEBUG
-         # axesGP.set_xticklabels([])
-         if alarmLineGPShow :
-   
-            alarmLineGP=datetime.combine(startDay, datetime.min.time())+timedelta(hours=10,minutes=29)
-            if (dfCur.index[-1]>=alarmLineGP):
-               # print(alarmLineGP) #DEBUG
-
-               axesGP.axvline(datetime.combine(startDay, datetime.min.time())+timedelta(hours=10,minutes=29),color=alarmColors[2])
-      if lenGX > 0:
-            # axes = fig.add_subplot(23,1,(1,2))
-            # axes.plot(dfx['time_tag2'].to_numpy(),dfx['flux'].to_numpy(),'-',color='k')
+         if networkAwareAlert :
+            # axesal.bar(df.index.values, df['Bartol_Above'], label='Bartol Simpson')
+            # axesal.plot(df.index.values, df['Bartol_Above'], label='Bartol Simpson')
+            # axesal.stackplot(dfCur.index.values, [dfCur['Bartol_Above'],dfCur['Extended_Above'],dfCur['Intl_Above']] , step="post", labels=['Current', 'Full Simpson', 'International'])
+            netArtists = drawNetwork(axesal, df.index.values, dfCur, scenarios[0], colorsPlot)
+            # axesal.stackplot(dfCur.index.values, [dfCur['Bartol_Above'],dfCur['Extended_Above']] , labels=['Bartol Simpson', 'Extended Simpson'])
+            # axesal.bar(dfCur.index.values, dfCur['Bartol_Above'],label='Bartol Simpson')
+            # axesal.bar(df.index.values, df['Bartol_Above'], bottom=df['Bartol_Above'], label='Extended Simpson')
+            # axesal.bar(df.index.values, df['Bartol_Above'], bottom=df['Bartol_Above']+df['Extended_Above'], label='International')
+         else :
+         
+            axesal.plot(dfStatus.index.values,3*np.ones(len(dfStatus)),'o',color='red',label=Status[3])
+            dfStatus = dfCur[dfCur['Status']==2]
             # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
             # plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
-            # plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
-            # plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
-            # plt.grid(axis='x',which='major',linewidth=0.5,linestyle='-',color='gray')
-            # plt.grid(axis='x',which='minor',linewidth=0.5,linestyle=':',color='gray')
-            # plt.grid(axis='y',which='major',linewidth=0.5,linestyle=':',color='gray')
-            # axes.set_yscale('log')
-            # axes.set_ylabel('GOES\n X-ray flux\n Watts m$^{-2}$ ',fontsize=fontsize,color='k', multialignment='center')
-            # axes.text(enddisp,1e-4,' X',fontsize=fontsize,color='k',verticalalignment='center', horizontalalignment='left')
-            # axes.text(enddisp,1e-5,' M',fontsize=fontsize,color='k',verticalalignment='center', horizontalalignment='left')
-            # axes.text(enddisp,1e-6,' C',fontsize=fontsize,color='k',verticalalignment='center', horizontalalignment='left')
-            # axes.set_xlim(startdisp,enddisp)
-   
-         # axesGX = fig.add_subplot(pAll,1,(pAll-(4+pG),pAll-(4+pG)),sharex=axesT)
-         axesGX = fig.add_subplot(pAll,1,(pAll-(2+pT+pG),pAll-(2+pT+pG)),sharex=axes)
-         axesGX.plot(dfGXCur.index.values,dfGXCur['xs'],color='green',label='XS')
-         axesGX.plot(dfGXCur.index.values,dfGXCur['xl'],color='k',label='XL')
-         # axesGP.plot(df500['time_tag2'].to_numpy(),df500['flux'].to_numpy(),color='pink',label='>=500 MeV')
-         # axesGX.set_ymargin(10*limMargin)
-         axesGX.set_ylim(yminGX,ymaxGX)
-         axesGX.set_yscale('log')
-         axesGX.set_ylabel('GOES\n X-ray flux\n Watts m$^{-2}$ ',fontsize=fontsize,color='k', multialignment='center')
+            # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
+            axesal.plot(dfStatus.index.values,2*np.ones(len(dfStatus)),'o',color='orange',label=Status[2])
+            dfStatus = dfCur[dfCur['Status']==1]
+            # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
+            # plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
+            # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
+            axesal.plot(dfStatus.index.values,1*np.ones(len(dfStatus)),'o',color='blue',label=Status[1])
+            dfStatus = dfCur[dfCur['Status']==0]
+            # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
+            # plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
+            # plt.tick_params(axis='y', which='major', labelsize=0,direction='in',length=6)
+            axesal.plot(dfStatus.index.values,0*np.ones(len(dfStatus)),'o',color='gray',label=Status[0])
+            axesal.set_ylim(0,3.75)
+            # axesal.set_ylabel('Alarm Level',fontsize=fontsize+1)
+            axesal.set_ylabel('Alarm Level',fontsize=fontsize)
+
          plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
          plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
-         plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
-         plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
-         plt.grid(axis='x',which='major',linewidth=0.5,linestyle='-',color='gray')
-         plt.grid(axis='x',which='minor',linewidth=0.5,linestyle=':',color='gray')
-         plt.grid(axis='y',which='major',linewidth=0.5,linestyle=':',color='gray')
-         # plt.legend(loc='upper right',fontsize=fontsize,ncol=1)
-         plt.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
-               fontsize=fontsize,labelspacing=0.5,frameon=False)
-         # print(pAll) #DEBUG
-         # print(axesGX.get_yticks()) #DEBUG
-         # print(axesGX.get_yticklabels()) #DEBUG
-         # sys.exit() #DEBUG
-
-         # axesGX.set_xticklabels([])
-
-      # axes.axhline(y=4,color='red')
-      axes.fill_between(x=df.index.values, y1=yminI, y2=4.0, color='lightgrey', alpha=0.5)
-
-      for i in range(len(alarmLines)):
-         if dfCur.index.values[-1] >= alarmLines[i]:
-            axes.axvline(alarmLines[i],color=alarmColors[i])
-            if (ratePlot): axesT.axvline(alarmLines[i],color=alarmColors[i])
-      if showBaselines :
-         for i in range(len(baselines)):
-            axes.axvline(baselines[i],color='green')
-            if (ratePlot):axesT.axvline(baselines[i],color='green')
-         if (3 > dfCur.iloc[-1]['Status']) :
-            baselines = [df.index[r-85],df.index[r-10] ]
-
-      # print(axes.get_xticklabels())  #DEBUG
-      # if (ratePlot):axesT.set_xticklabels([])
-
-      # axesal.set_xticklabels([])
-      # axesal.set_yticks([])
-      # axesal.set_yticklabels([])
-      # plt.yticks(np.arange(0, 4, 1.0))
-
-      # axesal.xaxis.set_major_locator(mdates.HourLocator(interval=1))
-      # axesal.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d\n%H:%M'))
-      plt.grid(axis='x',which='both',linewidth=0.5,linestyle=':',color='gray')
-      # plt.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
-      #          fontsize=fontsize,labelspacing=0.5,frameon=False)
-
-      # axesal.text(axesal.get_xlim()[0] + 0.02*(axesal.get_xlim()[1] -axesal.get_xlim()[0] ) ,
-      #          axesal.get_ylim()[1]- 0.15*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
-      #          # axesal.get_ylim()[1]- 0.12*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
-      #          "Current: ", horizontalalignment='left', fontsize=fontsize+1,zorder=10)
-
-      # axesal.text(axesal.get_xlim()[0] + 0.11*(axesal.get_xlim()[1] -axesal.get_xlim()[0] ) ,
-      #          axesal.get_ylim()[1]- 0.15*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
-      #          # axesal.get_ylim()[1]- 0.12*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
-      #          "{0:s}".format(Status[int(LastStatus)]), horizontalalignment='left',color=Statuscol[int(LastStatus)], fontsize=fontsize+1,zorder=10)
-
-      axesal.set_ylabel("Number of stations\nabove threshold",fontsize=fontsize,multialignment='center')
-
-      # axesal.text(axesal.get_xlim()[0], axesal.get_ylim()[1]+ 0.017*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
-            # 'Last update: {0:s} UT'.format(dfCur.index.values[-1]),fontsize=fontsize+1,horizontalalignment='left')
-
-
-      plt.subplots_adjust(left=0.1, bottom=0.06, right=0.8, top=0.95, wspace=0, hspace=0.00)
-
-      # print(yminT,ymaxT,yminI,ymaxI,yminGP,ymaxGP,yminGX,ymaxGX) #DEBUG
-      # print(axesT.yaxis.get_data_interval(),axes.yaxis.get_data_interval(),axesGP.yaxis.get_data_interval(),axesGX.yaxis.get_data_interval()) #DEBUG
-      # axesLabels = axes.get_xticklabels()
-      # for lbl in axesLabels :
-      #    lbl.set_visible(True)
-      # print(axes.get_xticklabels())
-
-
-      # fig.savefig('{0:s}/GLE_Alarm.png'.format(Outpath))
-      fig.savefig('{0:s}/{1:s}/{2:04d}.png'.format(Outpath, startTime.strftime("%Y%m%d"), frameNum))
-      frameNum+=1
-      LastStatus=int(dfCur.iloc[-1]['Status'])
-      plt.clf()
+         # plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
+         # plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
+         # axesal.plot(df[df['Status']==3]['Time'],3*np.ones(len(df[df['Status']==3])),'o',color='red',label=Status[3])
+         # axesal.plot(df[df['Status']==2]['Time'],2*np.ones(len(df[df['Status']==2])),'o',color='orange',label=Status[2])
+         # axesal.plot(df[df['Status']==1]['Time'],1.*np.ones(len(df[df['Status']==1])),'o',color='blue',label=Status[1])
+         # axesal.plot(df[df['Status']==0]['Time'],0*np.ones(len(df[df['Status']==0])),'o',color='gray',label=Status[0])
+         # axesal.set_ylabel('Alarm Level',fontsize=fontsize+1)
+         alLegend = plt.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
+                  fontsize=fontsize,labelspacing=0.5,frameon=False)
+
+         # print(axes.get_xticklabels())  #DEBUG
+         if lenGP > 0:
+            # axesGP = fig.add_subplot(pAll,1,(pAll-5,pAll-5),sharex=axesT)
+            axesGP = fig.add_subplot(pAll,1,(pAll-(3+pT),pAll-(3+pT)),sharex=axes)
+            axesGP.set_ylim(yminGP,ymaxGP)
+            # axesGP.yaxis.set_minor_locator(subs='auto')
+            axesGP.set_yscale('log')
+            # axesGP.yaxis.set_minor_locator(mticker.LogLocator( numticks=10, subs='auto'))
+            # print(axesGP.yaxis.get_tick_space()) #DEBUG
+            llGP=mticker.LogLocator(base=10.0, numticks=int(math.ceil(ydeltaGP)))#subs=np.arange(2, 10) * 0.1)
+            llmGP=mticker.LogLocator(base=10.0, numticks=int(math.ceil(ydeltaGP))*9, subs='auto')#subs=np.arange(2, 10) * 0.1)
+            axesGP.yaxis.set_major_locator(llGP)
+            axesGP.yaxis.set_minor_locator(llmGP)
+            # axesGP.yaxis.set_minor_formatter(mticker.LogFormatterMathtext(base=10.0,  labelOnlyBase=False))
+            axesGP.yaxis.set_major_formatter(mticker.LogFormatterMathtext(base=10.0,  labelOnlyBase=False,minor_thresholds=(0, 0)))
+            # print(axesGP.get_yticks()) #DEBUG
+            axesGP.plot(dfGPCur.index.values,dfGPCur['p3_flux_ic'],color='darkred',label='>=10 MeV')
+            axesGP.plot(dfGPCur.index.values,dfGPCur['p7_flux_ic'],color='darkblue',label='>=100 MeV')
+            # axesGP.plot(df500['time_tag2'].to_numpy(),df500['flux'].to_numpy(),color='pink',label='>=500 MeV')
+            # axesGP.set_ymargin(10*limMargin)
+            # axesGP.yaxis.set_major_locator(mticker.LogLocator(  subs='auto'))
+            axesGP.set_ylabel('GOES\n Particles\n cm$^{-2}$s$^{-1}$sr$^{-1}$ ',fontsize=fontsize,color='k', multialignment='center')
+            plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
+            plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
+            plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
+            plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
+            # print(axesGP.yaxis.get_tick_params(which='minor')) #DEBUG
+            plt.grid(axis='x',which='major',linewidth=0.5,linestyle='-',color='gray')
+            plt.grid(axis='x',which='minor',linewidth=0.5,linestyle=':',color='gray')
+            plt.grid(axis='y',which='major',linewidth=0.5,linestyle=':',color='gray')
+            # plt.legend(loc='upper right',fontsize=fontsize,ncol=1)
+            plt.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
+                  fontsize=fontsize,labelspacing=0.5,frameon=False)
+            # print(ymaxGP) #DEBUG
+            # axesGP.set_xticklabels([])
+            if alarmLineGPShow :
+   
+               alarmLineGP=datetime.combine(startDay, datetime.min.time())+timedelta(hours=10,minutes=29)
+               if (dfCur.index[-1]>=alarmLineGP):
+                  # print(alarmLineGP) #DEBUG
+
+                  axesGP.axvline(datetime.combine(startDay, datetime.min.time())+timedelta(hours=10,minutes=29),color=alarmColors[2])
+         if lenGX > 0:
+               # axes = fig.add_subplot(23,1,(1,2))
+               # axes.plot(dfx['time_tag2'].to_numpy(),dfx['flux'].to_numpy(),'-',color='k')
+               # plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
+               # plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
+               # plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
+               # plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
+               # plt.grid(axis='x',which='major',linewidth=0.5,linestyle='-',color='gray')
+               # plt.grid(axis='x',which='minor',linewidth=0.5,linestyle=':',color='gray')
+               # plt.grid(axis='y',which='major',linewidth=0.5,linestyle=':',color='gray')
+               # axes.set_yscale('log')
+               # axes.set_ylabel('GOES\n X-ray flux\n Watts m$^{-2}$ ',fontsize=fontsize,color='k', multialignment='center')
+               # axes.text(enddisp,1e-4,' X',fontsize=fontsize,color='k',verticalalignment='center', horizontalalignment='left')
+               # axes.text(enddisp,1e-5,' M',fontsize=fontsize,color='k',verticalalignment='center', horizontalalignment='left')
+               # axes.text(enddisp,1e-6,' C',fontsize=fontsize,color='k',verticalalignment='center', horizontalalignment='left')
+               # axes.set_xlim(startdisp,enddisp)
+   
+            # axesGX = fig.add_subplot(pAll,1,(pAll-(4+pG),pAll-(4+pG)),sharex=axesT)
+            axesGX = fig.add_subplot(pAll,1,(pAll-(2+pT+pG),pAll-(2+pT+pG)),sharex=axes)
+            axesGX.plot(dfGXCur.index.values,dfGXCur['xs'],color='green',label='XS')
+            axesGX.plot(dfGXCur.index.values,dfGXCur['xl'],color='k',label='XL')
+            # axesGP.plot(df500['time_tag2'].to_numpy(),df500['flux'].to_numpy(),color='pink',label='>=500 MeV')
+            # axesGX.set_ymargin(10*limMargin)
+            axesGX.set_ylim(yminGX,ymaxGX)
+            axesGX.set_yscale('log')
+            axesGX.set_ylabel('GOES\n X-ray flux\n Watts m$^{-2}$ ',fontsize=fontsize,color='k', multialignment='center')
+            plt.tick_params(axis='x', which='major', labelsize=0,direction='in',length=6)
+            plt.tick_params(axis='x', which='minor', labelsize=0,direction='in',length=3)
+            plt.tick_params(axis='y', which='major', labelsize=fontsize,direction='in',length=6)
+            plt.tick_params(axis='y', which='minor', labelsize=0,direction='in',length=3)
+            plt.grid(axis='x',which='major',linewidth=0.5,linestyle='-',color='gray')
+            plt.grid(axis='x',which='minor',linewidth=0.5,linestyle=':',color='gray')
+            plt.grid(axis='y',which='major',linewidth=0.5,linestyle=':',color='gray')
+            # plt.legend(loc='upper right',fontsize=fontsize,ncol=1)
+            plt.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
+                  fontsize=fontsize,labelspacing=0.5,frameon=False)
+            # print(pAll) #DEBUG
+            # print(axesGX.get_yticks()) #DEBUG
+            # print(axesGX.get_yticklabels()) #DEBUG
+            # sys.exit() #DEBUG
+
+            # axesGX.set_xticklabels([])
+
+         # axes.axhline(y=4,color='red')
+         axes.fill_between(x=df.index.values, y1=yminI, y2=4.0, color='lightgrey', alpha=0.5)
+
+         for i in range(len(alarmLines)):
+            if dfCur.index.values[-1] >= alarmLines[i]:
+               axes.axvline(alarmLines[i],color=alarmColors[i])
+               if (ratePlot): axesT.axvline(alarmLines[i],color=alarmColors[i])
+         if showBaselines :
+            baselines = [df.index[p] for p in baselineRows[r]]
+            for i in range(len(baselines)):
+               axes.axvline(baselines[i],color='green')
+               if (ratePlot):axesT.axvline(baselines[i],color='green')
+
+         # print(axes.get_xticklabels())  #DEBUG
+         # if (ratePlot):axesT.set_xticklabels([])
+
+         # axesal.set_xticklabels([])
+         # axesal.set_yticks([])
+         # axesal.set_yticklabels([])
+         # plt.yticks(np.arange(0, 4, 1.0))
+
+         # axesal.xaxis.set_major_locator(mdates.HourLocator(interval=1))
+         # axesal.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d\n%H:%M'))
+         plt.grid(axis='x',which='both',linewidth=0.5,linestyle=':',color='gray')
+         # plt.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
+         #          fontsize=fontsize,labelspacing=0.5,frameon=False)
+
+         # axesal.text(axesal.get_xlim()[0] + 0.02*(axesal.get_xlim()[1] -axesal.get_xlim()[0] ) ,
+         #          axesal.get_ylim()[1]- 0.15*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
+         #          # axesal.get_ylim()[1]- 0.12*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
+         #          "Current: ", horizontalalignment='left', fontsize=fontsize+1,zorder=10)
+
+         # axesal.text(axesal.get_xlim()[0] + 0.11*(axesal.get_xlim()[1] -axesal.get_xlim()[0] ) ,
+         #          axesal.get_ylim()[1]- 0.15*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
+         #          # axesal.get_ylim()[1]- 0.12*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
+         #          "{0:s}".format(Status[int(LastStatus)]), horizontalalignment='left',color=Statuscol[int(LastStatus)], fontsize=fontsize+1,zorder=10)
+
+         axesal.set_ylabel("Number of stations\nabove threshold",fontsize=fontsize,multialignment='center')
+
+         # axesal.text(axesal.get_xlim()[0], axesal.get_ylim()[1]+ 0.017*(axesal.get_ylim()[1] -axesal.get_ylim()[0] ),
+               # 'Last update: {0:s} UT'.format(dfCur.index.values[-1]),fontsize=fontsize+1,horizontalalignment='left')
+
+
+         plt.subplots_adjust(left=0.1, bottom=0.06, right=0.8, top=0.95, wspace=0, hspace=0.00)
+
+         # print(yminT,ymaxT,yminI,ymaxI,yminGP,ymaxGP,yminGX,ymaxGX) #DEBUG
+         # print(axesT.yaxis.get_data_interval(),axes.yaxis.get_data_interval(),axesGP.yaxis.get_data_interval(),axesGX.yaxis.get_data_interval()) #DEBUG
+         # axesLabels = axes.get_xticklabels()
+         # for lbl in axesLabels :
+         #    lbl.set_visible(True)
+         # print(axes.get_xticklabels())
+
+
+         # fig.savefig('{0:s}/GLE_Alarm.png'.format(Outpath))
+         #the other scenarios only redraw the network panel
+         for k, scenario in enumerate(scenarios):
+            if k > 0:
+               for a in netArtists + [alLegend]: a.remove()
+               netArtists = drawNetwork(axesal, df.index.values, dfCur, scenario, colorsPlot)
+               alLegend = axesal.legend(bbox_to_anchor=(1.01,0.48), loc="center left", borderaxespad=0,
+                        fontsize=fontsize,labelspacing=0.5,frameon=False)
+            if frameContainer:
+               frameBuf = io.BytesIO()
+               fig.savefig(frameBuf, format='png')
+               GLEFrameStore.writeFrame(frameStores[k], frameNum, dfCur.index[-1], frameBuf.getvalue())
+            else:
+               fig.savefig('{0:s}/{1:s}/{2:s}{3:04d}.png'.format(Outpath, startTime.strftime("%Y%m%d"), scenario['path'], frameNum))
+         frameNum+=1
+         if not np.isnan(dfCur.iloc[-1]['Status']): LastStatus=int(dfCur.iloc[-1]['Status'])
+         plt.clf()
+
+         if longRunInterval > 0 and 0 == (frameNum-firstFrame) % longRunInterval:
+            #start over with a new figure so that nothing accumulates across frames
+            plt.close(fig)
+            gc.collect()
+            fig=plt.figure(figsize=(14, 11), dpi=80)
+
+            rss = currentRSS()
+            longRunLog.writerow([frameNum, dfCur.index[-1].isoformat(),
+                                 '{0:.3f}'.format((time.perf_counter()-intervalStart)/longRunInterval), '{0:.1f}'.format(rss)])
+            longRunFile.flush()
+            intervalStart = time.perf_counter()
+            if rssStart is None: rssStart = rss
+            if rssLimit > 0 and (rss-rssStart) > rssLimit and frameNum < (endMinutes+1)-startMinutes-initMinutes:
+               print('Memory grew by {0:.1f} MB to {1:.1f} MB at frame {2:d}'.format(rss-rssStart, rss, frameNum))
+               if restartWorker:
+                  if frameContainer:
+                     for frameStore in frameStores:
+                        GLEFrameStore.closeStore(frameStore)
+                     frameStores = []
+                  longRunFile.close()
+                  restartArgv = []
+                  for opt, arg in opts:
+                     if '-F' != opt: restartArgv += [opt, arg] if arg else [opt]
+                  print('Restarting from frame {0:d}'.format(frameNum))
+                  sys.stdout.flush()
+                  os.execv(sys.executable, [sys.executable, os.path.abspath(__file__)]+restartArgv+['-F', str(frameNum)])
+
+   finally:
+      #close the outputs on errors too, so that the frames rendered so far are kept
+      if frameContainer:
+         for frameStore in frameStores:
+            GLEFrameStore.closeStore(frameStore)
+      if longRunInterval > 0:
+         longRunFile.close()
 
 
    #for i in range(N-1):